@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import logging
+import os
 import re
 import socket
 import subprocess
@@ -32,6 +33,9 @@ ENABLE_TOOLCHANGE_M104_WAIT = True
 # Heat soak defaults
 DEFAULT_HEAT_SOAK_TIME = "5.0"
 
+# File output
+WRITE_BUFFER_SIZE = 1 << 20  # bytes
+
 # Logging
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
@@ -63,6 +67,8 @@ class ConnectivityStatus:
 
 
 moonraker_connectivity = ConnectivityStatus()
+_connectivity_lock = threading.Lock()
+_connectivity_settled = False
 
 
 class ProcessingCancelled(Exception):
@@ -113,21 +119,14 @@ class GCodeDocument:
 
     def write(self) -> None:
         self.ensure_trailing_newline()
-        self.path.write_text("".join(self.lines), encoding="utf-8")
+        with self.path.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fh:
+            fh.writelines(self.lines)
 
     def replace_text(self, transform: Callable[[str], str]) -> None:
         text = "".join(self.lines)
         new_text = transform(text)
         self.lines = new_text.splitlines(True)
 
-    def append_status(self, messages: Sequence[str]) -> None:
-        self.ensure_trailing_newline()
-        # Add a clean summary header
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.lines.append(f"\n; --- Post-processing summary (v{SCRIPT_VERSION}) @ {timestamp} ---\n")
-        for message in messages:
-            self.lines.append(message + "\n")
-
 
 # =============================================================================
 # Small helpers
@@ -147,9 +146,35 @@ def wipe_gcode_file(path: Path, reason: str) -> None:
         logging.error("Failed to wipe G-code file %s: %s", path, exc)
 
 
+def append_status(path: Path, messages: Sequence[str]) -> None:
+    """Append the summary block to the G-code file without reloading it.
+
+    The summary reuses the line terminator already at the end of the file so
+    line endings stay consistent with whatever wrote it last.
+    """
+    with path.open("rb") as fh:
+        size = fh.seek(0, os.SEEK_END)
+        fh.seek(max(size - 2, 0))
+        tail = fh.read()
+
+    if tail.endswith(b"\r\n"):
+        eol, prefix = "\r\n", ""
+    elif tail.endswith((b"\n", b"\r")):
+        eol, prefix = tail[-1:].decode(), ""
+    else:
+        eol = os.linesep
+        prefix = eol if tail else ""
+
+    # Add a clean summary header
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with path.open("a", encoding="utf-8", newline="") as fh:
+        fh.write(f"{prefix}{eol}; --- Post-processing summary (v{SCRIPT_VERSION}) @ {timestamp} ---{eol}")
+        fh.writelines(message + eol for message in messages)
+
+
 def strip_inline_comment(line: str) -> str:
     """Return the part of a G-code line before any ';' comment."""
-    return line.split(";", 1)[0]
+    return line.partition(";")[0]
 
 
 def _center_window(root: ctk.CTk, width: int, height: int) -> None:
@@ -306,16 +331,6 @@ def show_moonraker_connectivity_popup() -> bool:
         ).pack(anchor="w", pady=(0, 8))
 
         detail_text = moonraker_connectivity.message or "Unknown connectivity error."
-        ctk.CTkTextbox(
-            card,
-            height=100,
-            corner_radius=12,
-            fg_color=INSET_BG,
-            text_color=TEXT_PRIMARY,
-            font=ctk.CTkFont(size=12),
-            wrap="word",
-        ).pack_forget()  # Prepare widget
-
         detail_box = ctk.CTkTextbox(
             card,
             height=100,
@@ -482,16 +497,17 @@ def show_heat_soak_gui() -> Optional[float]:
 
     def update_validation_feedback(*_args) -> None:
         value = soak_time_var.get().strip()
-        normalized = None if value == "" else validate_soak_value(value)
-        if normalized is None:
+        is_valid = value != "" and validate_soak_value(value) is not None
+        if is_valid == apply_enabled[0]:
+            # Nothing changed; skip reconfiguring widgets on every keystroke
+            return
+        if is_valid:
+            status_label.configure(text="", text_color=DANGER_COLOR)
+            apply_button.configure(state="normal")
+        else:
             status_label.configure(text="Enter a non-negative number (minutes).", text_color=DANGER_COLOR)
             apply_button.configure(state="disabled")
-            apply_enabled[0] = False
-        else:
-            status_label.configure(text="", text_color=DANGER_COLOR)
-            if not apply_enabled[0]:
-                apply_button.configure(state="normal")
-            apply_enabled[0] = True
+        apply_enabled[0] = is_valid
 
     def process_file(soak_value: Optional[float] = None) -> None:
         if soak_value is not None:
@@ -607,7 +623,7 @@ def check_moonraker_connectivity() -> Tuple[bool, str]:
     except ValueError as exc:
         return False, str(exc)
 
-    start_time = time.time()
+    start_time = time.monotonic()
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.settimeout(MOONRAKER_TIMEOUT)
         try:
@@ -617,16 +633,23 @@ def check_moonraker_connectivity() -> Tuple[bool, str]:
         except socket.error as exc:
             return False, f"Failed to connect to Moonraker at {host}:{port}: {exc}"
 
-    elapsed = time.time() - start_time
+    elapsed = time.monotonic() - start_time
     return True, f"Connected to Moonraker at {host}:{port} in {elapsed:.2f}s"
 
 
+def _settle_connectivity(connected: bool, message: str) -> None:
+    """Publish the first connectivity outcome; anything arriving later is stale."""
+    global moonraker_connectivity, _connectivity_settled
+    with _connectivity_lock:
+        if _connectivity_settled:
+            return
+        moonraker_connectivity = ConnectivityStatus(checked=True, connected=connected, message=message)
+        _connectivity_settled = True
+
+
 def background_connectivity_check() -> None:
-    global moonraker_connectivity
     is_connected, message = check_moonraker_connectivity()
-    moonraker_connectivity.checked = True
-    moonraker_connectivity.connected = is_connected
-    moonraker_connectivity.message = message
+    _settle_connectivity(is_connected, message)
 
 
 def start_connectivity_check() -> Optional[threading.Thread]:
@@ -644,28 +667,37 @@ def wait_for_connectivity_check(thread: Optional[threading.Thread]) -> None:
         return
 
     max_wait = MOONRAKER_TIMEOUT
-    deadline = time.time() + max_wait
-
-    while thread.is_alive() and time.time() < deadline:
-        time.sleep(0.1)
+    thread.join(timeout=max_wait)
 
     if thread.is_alive():
-        moonraker_connectivity.checked = True
-        moonraker_connectivity.connected = False
-        moonraker_connectivity.message = f"Connectivity check timed out after {max_wait}s"
+        _settle_connectivity(False, f"Connectivity check timed out after {max_wait}s")
 
 
 # =============================================================================
 # G-code transformations
 # =============================================================================
 
+TOOL_RE = re.compile(r'^\s*T(\d+)\b', re.IGNORECASE)
+M104_RE = re.compile(r'^\s*M104\b', re.IGNORECASE)
+S_VALUE_RE = re.compile(r'\bS\s*(-?\d+(?:\.\d+)?)\b', re.IGNORECASE)
+TEMPERATURE_WAIT_RE = re.compile(r'^\s*TEMPERATURE_WAIT\b.*\bSENSOR\s*=\s*extruder\b', re.IGNORECASE)
+LEADING_WS_RE = re.compile(r'^(\s*)')
+
+# Filament swap spiral sequence; lookaheads ignore inline comments and allow extra params/spacing
+SPIRAL_ARC_RE = re.compile(r'^\s*G2\b(?=[^;]*\bZ0\.4\b)(?=[^;]*\bI0\.86\b)(?=[^;]*\bJ0\.86\b)(?=[^;]*\bP1\b)(?=[^;]*\bF10000\b)', re.IGNORECASE)
+SPIRAL_PARK_RE = re.compile(r'^\s*G1\b(?=[^;]*\bX0\b)(?=[^;]*\bY245\b)(?=[^;]*\bF30000\b)', re.IGNORECASE)
+SPIRAL_DROP_RE = re.compile(r'^\s*G1\b(?=[^;]*\bZ0\b)(?=[^;]*\bF600\b)', re.IGNORECASE)
+
+START_PRINT_RE = re.compile(r"(START_PRINT\s+[^;\n]*?)(\s*;|\s*\n)", re.IGNORECASE)
+SOAK_TIME_RE = re.compile(r"SOAK_TIME=\S+")
+
+
 def remove_duplicate_tool(lines: List[str]) -> Tuple[List[str], str]:
     """Remove duplicate tool selection before the first layer.
     Special-case: if the initial tool is T4, remove BOTH first and second T4 before first layer.
     For other tools: we keep the first and comment any duplicates before first layer (only the next duplicate is reported).
     """
     # Find first tool selection (T<number>) ignoring comments
-    tool_re = re.compile(r'^\s*T(\d+)\b', re.IGNORECASE)
     first_tool_num: Optional[int] = None
     first_tool_idx = -1
 
@@ -673,7 +705,7 @@ def remove_duplicate_tool(lines: List[str]) -> Tuple[List[str], str]:
         code = strip_inline_comment(raw).strip()
         if not code:
             continue
-        m = tool_re.match(code)
+        m = TOOL_RE.match(code)
         if m:
             first_tool_num = int(m.group(1))
             first_tool_idx = i
@@ -698,7 +730,8 @@ def remove_duplicate_tool(lines: List[str]) -> Tuple[List[str], str]:
         second_idx = -1
         for i in range(first_tool_idx + 1, layer_change_idx):
             code = strip_inline_comment(lines[i]).strip()
-            if tool_re.match(code) and int(tool_re.match(code).group(1)) == 4:
+            m = TOOL_RE.match(code)
+            if m and int(m.group(1)) == 4:
                 second_idx = i
                 break
         if second_idx != -1:
@@ -711,7 +744,7 @@ def remove_duplicate_tool(lines: List[str]) -> Tuple[List[str], str]:
         duplicate_idx = -1
         for i in range(first_tool_idx + 1, layer_change_idx):
             code = strip_inline_comment(lines[i]).strip()
-            m = tool_re.match(code)
+            m = TOOL_RE.match(code)
             if m and int(m.group(1)) == first_tool_num:
                 duplicate_idx = i
                 comment_out(i, "REMOVED DUPLICATE TOOL")
@@ -732,11 +765,6 @@ def remove_filament_swap_spiral(lines: List[str]) -> Tuple[List[str], str]:
        Search stops if '; filament start gcode' is encountered first.
        Matching is tolerant to whitespace and inline comments.
     """
-    # Regexes that ignore inline comments and allow extra params/spacing
-    p1 = re.compile(r'^\s*G2\b(?=[^;]*\bZ0\.4\b)(?=[^;]*\bI0\.86\b)(?=[^;]*\bJ0\.86\b)(?=[^;]*\bP1\b)(?=[^;]*\bF10000\b)', re.IGNORECASE)
-    p2 = re.compile(r'^\s*G1\b(?=[^;]*\bX0\b)(?=[^;]*\bY245\b)(?=[^;]*\bF30000\b)', re.IGNORECASE)
-    p3 = re.compile(r'^\s*G1\b(?=[^;]*\bZ0\b)(?=[^;]*\bF600\b)', re.IGNORECASE)
-
     removed = False
     reason = ""
     first_pos = second_pos = third_pos = -1
@@ -749,11 +777,11 @@ def remove_filament_swap_spiral(lines: List[str]) -> Tuple[List[str], str]:
             break
 
         code = strip_inline_comment(lines[i])
-        if first_pos == -1 and p1.search(code):
+        if first_pos == -1 and SPIRAL_ARC_RE.search(code):
             first_pos = i
-        elif first_pos != -1 and second_pos == -1 and p2.search(code):
+        elif first_pos != -1 and second_pos == -1 and SPIRAL_PARK_RE.search(code):
             second_pos = i
-        elif first_pos != -1 and second_pos != -1 and third_pos == -1 and p3.search(code):
+        elif first_pos != -1 and second_pos != -1 and third_pos == -1 and SPIRAL_DROP_RE.search(code):
             third_pos = i
             # Comment out found lines (from last to first)
             lines[third_pos] = f"; REMOVED FILAMENT SWAP SPIRAL (PART 3/3): {lines[third_pos].rstrip()}\n"
@@ -782,13 +810,9 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
     Returns (updated lines, summary, optional low-temp warning).
     """
     toolchange_count = 0
-    inserted_count = 0
     low_temp_count = 0
-
-    tool_re = re.compile(r'^\s*T(\d+)\b', re.IGNORECASE)
-    m104_re = re.compile(r'^\s*M104\b', re.IGNORECASE)
-    s_val_re = re.compile(r'\bS\s*(-?\d+(?:\.\d+)?)\b', re.IGNORECASE)
-    tempwait_re = re.compile(r'^\s*TEMPERATURE_WAIT\b.*\bSENSOR\s*=\s*extruder\b', re.IGNORECASE)
+    # (index of M104 line, line to insert after it), applied in one pass at the end
+    insertions: List[Tuple[int, str]] = []
 
     i = 0
     n = len(lines)
@@ -808,7 +832,7 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
                 code = strip_inline_comment(lines[idx]).lstrip()
                 if not code or code.startswith(";"):
                     continue
-                if tool_re.match(code):
+                if TOOL_RE.match(code):
                     last_t_index = idx
 
             if last_t_index != -1:
@@ -819,8 +843,8 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
                     code = strip_inline_comment(lines[idx]).lstrip()
                     if not code or code.startswith(";"):
                         continue
-                    if m104_re.match(code):
-                        s_match = s_val_re.search(code)
+                    if M104_RE.match(code):
+                        s_match = S_VALUE_RE.search(code)
                         if s_match:
                             last_m104_index = idx
                             last_m104_s_str = s_match.group(1)
@@ -838,23 +862,19 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
                         if not next_code or next_code.startswith(";"):
                             j += 1
                             continue
-                        if tempwait_re.match(next_code):
+                        if TEMPERATURE_WAIT_RE.match(next_code):
                             s_value = None  # mark as already handled
                         break
 
                     if s_value is not None and s_value >= 200:
                         min_str = f"{s_value - 2:g}"
                         max_str = f"{s_value + 2:g}"
-                        leading_ws = re.match(r'^(\s*)', lines[last_m104_index]).group(1)
+                        leading_ws = LEADING_WS_RE.match(lines[last_m104_index]).group(1)
                         inserted_line = (
                             f"{leading_ws}TEMPERATURE_WAIT SENSOR=extruder MINIMUM={min_str} MAXIMUM={max_str} "
                             f";M104 S{last_m104_s_str} wait inserted.\n"
                         )
-                        lines.insert(last_m104_index + 1, inserted_line)
-                        inserted_count += 1
-                        # Adjust pointers due to insertion
-                        n += 1
-                        end_idx += 1
+                        insertions.append((last_m104_index, inserted_line))
                     elif s_value is not None and s_value < 200:
                         low_temp_count += 1
 
@@ -863,7 +883,17 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
         else:
             i += 1
 
-    summary_message = f"; {toolchange_count} toolchange block(s) detected; inserted {inserted_count} TEMPERATURE_WAIT command(s)"
+    if insertions:
+        updated: List[str] = []
+        start = 0
+        for idx, inserted_line in insertions:
+            updated.extend(lines[start:idx + 1])
+            updated.append(inserted_line)
+            start = idx + 1
+        updated.extend(lines[start:])
+        lines = updated
+
+    summary_message = f"; {toolchange_count} toolchange block(s) detected; inserted {len(insertions)} TEMPERATURE_WAIT command(s)"
     low_temp_warning = None
     if low_temp_count > 0:
         low_temp_warning = f"; Warning: {low_temp_count} M104 command(s) below 200 found in toolchange blocks; no wait added"
@@ -873,14 +903,13 @@ def replace_m104_after_toolchange(lines: List[str]) -> Tuple[List[str], str, Opt
 
 def apply_heat_soak(document: GCodeDocument, soak_time: float) -> str:
     """Add or update SOAK_TIME in the first START_PRINT command."""
-    pattern = re.compile(r"(START_PRINT\s+[^;\n]*?)(\s*;|\s*\n)", re.IGNORECASE)
 
     def add_soak_time(match: re.Match) -> str:
         start_print_cmd = match.group(1)
         line_end = match.group(2)
 
         if "SOAK_TIME=" in start_print_cmd:
-            modified_cmd = re.sub(r"SOAK_TIME=\S+", f"SOAK_TIME={soak_time}", start_print_cmd)
+            modified_cmd = SOAK_TIME_RE.sub(f"SOAK_TIME={soak_time}", start_print_cmd)
         else:
             modified_cmd = f"{start_print_cmd} SOAK_TIME={soak_time}"
 
@@ -888,7 +917,7 @@ def apply_heat_soak(document: GCodeDocument, soak_time: float) -> str:
 
     try:
         # Only change the first occurrence
-        document.replace_text(lambda text: pattern.sub(add_soak_time, text, count=1))
+        document.replace_text(lambda text: START_PRINT_RE.sub(add_soak_time, text, count=1))
         return f"; Heat soak: Set to {soak_time} minutes in START_PRINT"
     except Exception as exc:
         raise Exception(f"Heat soak configuration error: {exc}")
@@ -981,12 +1010,10 @@ def main():
         else:
             report.add_message("; Klipper Estimator: Disabled")
 
-        # Reload to append summary at end of file
-        document = GCodeDocument.load(gcode_path)
+        # Append summary at end of file (the estimator may have rewritten it)
         status_lines: List[str] = [msg for msg in report.messages if msg]
         status_lines.extend(warning for warning in report.warnings if warning)
-        document.append_status(status_lines)
-        document.write()
+        append_status(gcode_path, status_lines)
 
     except ProcessingCancelled as exc:
         logging.info("Processing cancelled: %s", exc or exc.__class__.__name__)
@@ -90,6 +90,10 @@ class FileTransferError(InstallerError):
 # ---------------------------------------------------------------------------
 
 
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+LOG_LEVELS = {"ERROR": logging.ERROR, "WARNING": logging.WARNING}
+
+
 @dataclass(frozen=True)
 class InstallerConfig:
     username: str = "root"
@@ -97,6 +101,7 @@ class InstallerConfig:
     keepalive_interval: int = 10
     connect_timeout: int = 15
     command_check_interval: float = 0.2
+    max_reads_per_poll: int = 8
     remote_path_export: str = (
         "export PATH=/opt/bin:/opt/sbin:/usr/local/bin:/usr/bin:/bin:/usr/sbin:/sbin;"
     )
@@ -106,6 +111,7 @@ class InstallerConfig:
     remote_repo_url: str = "https://github.com/Jacob10383/Printer.git"
     k2_script_path: str = "/mnt/UDISK/root/k2-improvements/gimme-the-jamin.sh"
     moonraker_database_dir: str = "/mnt/UDISK/root/printer_data/database"
+    moonraker_database_files: tuple[str, ...] = ("data.mdb", "moonraker-sql.db")
     moonraker_service: str = "moonraker"
 
 
@@ -261,14 +267,12 @@ class RemoteExecutor:
         buffers = {"stdout": "", "stderr": ""}
         collected = {"stdout": [], "stderr": []}
         success_seen = False
-        start_time = time.time()
+        start_time = time.monotonic()
 
         def _process_stream(kind: str, chunk: str) -> None:
             nonlocal success_seen
-            buffers[kind] += chunk
-            while "\n" in buffers[kind]:
-                line, rest = buffers[kind].split("\n", 1)
-                buffers[kind] = rest
+            *lines, buffers[kind] = (buffers[kind] + chunk).split("\n")
+            for line in lines:
                 clean_line = line.rstrip("\r")
                 collected[kind].append(clean_line)
                 self._logger.debug("REMOTE %s: %s", kind.upper(), clean_line)
@@ -280,24 +284,34 @@ class RemoteExecutor:
 
         try:
             while True:
-                if timeout is not None and (time.time() - start_time) > timeout:
+                if timeout is not None and (time.monotonic() - start_time) > timeout:
                     channel.close()
                     raise CommandExecutionError(
                         f"Remote command timed out after {timeout} seconds: {command}"
                     )
 
-                if channel.recv_ready():
-                    data = channel.recv(4096).decode("utf-8", errors="replace")
+                # Drain buffered output before sleeping again, capped per poll so
+                # the timeout and the other stream are still serviced
+                received = False
+                for _ in range(self._config.max_reads_per_poll):
+                    if not channel.recv_ready():
+                        break
+                    data = channel.recv(32768).decode("utf-8", errors="replace")
                     _process_stream("stdout", data)
+                    received = True
 
-                if channel.recv_stderr_ready():
-                    data = channel.recv_stderr(4096).decode("utf-8", errors="replace")
+                for _ in range(self._config.max_reads_per_poll):
+                    if not channel.recv_stderr_ready():
+                        break
+                    data = channel.recv_stderr(32768).decode("utf-8", errors="replace")
                     _process_stream("stderr", data)
+                    received = True
 
                 if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
                     break
 
-                time.sleep(self._config.command_check_interval)
+                if not received:
+                    time.sleep(self._config.command_check_interval)
 
             if buffers["stdout"]:
                 _process_stream("stdout", "\n")
@@ -319,11 +333,11 @@ class RemoteExecutor:
                     stderr="\n".join(collected["stderr"]),
                     exit_status=None,
                     success_tokens_seen=success_seen,
-                    elapsed=time.time() - start_time,
+                    elapsed=time.monotonic() - start_time,
                 )
             raise CommandExecutionError("Remote command failed during execution") from exc
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         stdout_text = "\n".join(collected["stdout"])
         stderr_text = "\n".join(collected["stderr"])
@@ -418,8 +432,8 @@ class PrinterInstaller:
         self.reset = reset
         self.preserve_stats = preserve_stats
         self.config = InstallerConfig()
-        self.log_file = f"printer_install_{printer_ip}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        self.start_time = time.time()
+        self.log_file = f"printer_install_{printer_ip}_{datetime.now().strftime(TIMESTAMP_FORMAT)}.log"
+        self.start_time = time.monotonic()
         self.bootstrap_path = Path(__file__).parent / "bootstrap"
         self.bootstrap_tar = Path(__file__).parent / "bootstrap.tar.gz"
         self.moonraker_backup_dir: Optional[Path] = None
@@ -475,21 +489,14 @@ class PrinterInstaller:
         self.logger.info(f"Logging to file: {self.log_file}")
         
     def log(self, message: str, level: str = "INFO") -> None:
-        if level == "ERROR":
-            self.logger.error(message)
-        elif level == "WARNING":
-            self.logger.warning(message)
-        else:
-            self.logger.info(message)
-            
+        self.logger.log(LOG_LEVELS.get(level, logging.INFO), message)
+
     def file_log(self, message: str, level: str = "INFO") -> None:
-        extra = {"to_console": False}
-        if level == "ERROR":
-            self.logger.error(message, extra=extra)
-        elif level == "WARNING":
-            self.logger.warning(message, extra=extra)
-        else:
-            self.logger.info(message, extra=extra)
+        self.logger.log(
+            LOG_LEVELS.get(level, logging.INFO),
+            message,
+            extra={"to_console": False},
+        )
 
     def log_step(self, step_number: int, title: str) -> None:
         self.logger.info(
@@ -603,24 +610,20 @@ class PrinterInstaller:
         )
         self.log(msg)
         self.ensure_ssh_access()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
         self.moonraker_backup_dir = Path.cwd() / f"moonraker_backup_{self.printer_ip}_{timestamp}"
         self.moonraker_backup_dir.mkdir(parents=True, exist_ok=True)
 
-        targets = [
-            f"{self.config.moonraker_database_dir}/data.mdb",
-            f"{self.config.moonraker_database_dir}/moonraker-sql.db",
-        ]
-
         succeeded = 0
         failed: list[str] = []
 
         with self.executor.sftp() as sftp:
-            for remote_file in targets:
-                local_path = self.moonraker_backup_dir / Path(remote_file).name
+            for name in self.config.moonraker_database_files:
+                remote_file = f"{self.config.moonraker_database_dir}/{name}"
+                local_path = self.moonraker_backup_dir / name
                 try:
                     sftp.get(remote_file, str(local_path))
-                    self.moonraker_backup_files[Path(remote_file).name] = local_path
+                    self.moonraker_backup_files[name] = local_path
                     succeeded += 1
                 except IOError as exc:
                     failed.append(remote_file)
@@ -636,6 +639,12 @@ class PrinterInstaller:
         )
         self.log(f"Backed up {succeeded} Moonraker stats file(s)")
 
+    def use_backup_dir(self, backup_dir: Path) -> None:
+        self.moonraker_backup_dir = backup_dir
+        self.moonraker_backup_files = {
+            name: backup_dir / name for name in self.config.moonraker_database_files
+        }
+
     def restore_moonraker_stats(self, *, force: bool = False) -> None:
         if not self.preserve_stats and not force:
             return
@@ -792,7 +801,7 @@ class PrinterInstaller:
         self.log("Reset acknowledged; waiting 30 seconds for device to reboot")
         time.sleep(30)
 
-        start = time.time()
+        start = time.monotonic()
         self.executor.close()
 
         while True:
@@ -808,7 +817,7 @@ class PrinterInstaller:
             if "online" in result.stdout:
                 break
 
-        elapsed = int(time.time() - start)
+        elapsed = int(time.monotonic() - start)
         self.log(f"Device back online after {elapsed}s")
 
     @staticmethod
@@ -863,7 +872,7 @@ class PrinterInstaller:
                 except InstallerError as exc:
                     self.log(f"Moonraker stats restore failed: {exc}", "ERROR")
             
-            total_time = time.time() - self.start_time
+            total_time = time.monotonic() - self.start_time
             minutes = int(total_time // 60)
             seconds = int(total_time % 60)
             
@@ -881,7 +890,7 @@ class PrinterInstaller:
             self.executor.close()
 
     def _handle_failure(self, error: InstallerError) -> None:
-        total_time = time.time() - self.start_time
+        total_time = time.monotonic() - self.start_time
         minutes = int(total_time // 60)
         seconds = int(total_time % 60)
 
@@ -964,7 +973,7 @@ Examples:
     args = parser.parse_args()
     
     # Validate modes: --key-only, --backup-only, --restore-only are mutually exclusive
-    modes_selected = sum(1 for x in (args.key_only, args.backup_only, bool(args.restore_only)) if x)
+    modes_selected = sum((args.key_only, args.backup_only, bool(args.restore_only)))
     if modes_selected > 1:
         print("ERROR: Choose only one mode: --key-only, --backup-only, or --restore-only.")
         sys.exit(2)
@@ -988,10 +997,10 @@ Examples:
     # Validate provided backup directories exist and are complete
     def _validate_backup_dir(path_str: str) -> None:
         backup_dir = Path(path_str)
-        if not backup_dir.exists() or not backup_dir.is_dir():
+        if not backup_dir.is_dir():
             print(f"ERROR: Backup directory does not exist: {backup_dir}")
             sys.exit(2)
-        required_files = ["data.mdb", "moonraker-sql.db"]
+        required_files = InstallerConfig.moonraker_database_files
         missing = [name for name in required_files if not (backup_dir / name).exists()]
         if missing:
             print(f"ERROR: Backup directory is missing required files: {', '.join(missing)} in {backup_dir}")
@@ -1027,11 +1036,7 @@ Examples:
 
     if args.restore_only:
         installer.ensure_ssh_access()
-        installer.moonraker_backup_dir = Path(args.restore_only)
-        installer.moonraker_backup_files = {
-            "data.mdb": installer.moonraker_backup_dir / "data.mdb",
-            "moonraker-sql.db": installer.moonraker_backup_dir / "moonraker-sql.db"
-        }
+        installer.use_backup_dir(Path(args.restore_only))
         installer.restore_moonraker_stats(force=True)
         print("Restore completed successfully.")
         sys.exit(0)
@@ -1039,11 +1044,7 @@ Examples:
     if args.reset and args.preserve_stats:
         if args.restore_backup:
             # Use manually specified backup
-            installer.moonraker_backup_dir = Path(args.restore_backup)
-            installer.moonraker_backup_files = {
-                "data.mdb": installer.moonraker_backup_dir / "data.mdb",
-                "moonraker-sql.db": installer.moonraker_backup_dir / "moonraker-sql.db"
-            }
+            installer.use_backup_dir(Path(args.restore_backup))
         else:
             # Create new backup as usual
             installer.backup_moonraker_stats()
@@ -1055,11 +1056,7 @@ Examples:
 
     # If a specific backup was requested for restore during install, perform restore now
     if args.restore_backup:
-        installer.moonraker_backup_dir = Path(args.restore_backup)
-        installer.moonraker_backup_files = {
-            "data.mdb": installer.moonraker_backup_dir / "data.mdb",
-            "moonraker-sql.db": installer.moonraker_backup_dir / "moonraker-sql.db"
-        }
+        installer.use_backup_dir(Path(args.restore_backup))
         installer.restore_moonraker_stats(force=True)
 
 
@@ -6,6 +6,8 @@ from typing import Iterable
 
 from .file_ops import ensure_directory, write_text
 
+_INCLUDE_RE = re.compile(r"^\s*\[include\s+(.+?)\s*\]\s*$")
+
 
 def _normalize_lines(path: Path) -> list[str]:
     if not path.exists():
@@ -21,11 +23,10 @@ def ensure_include_block(path: Path | str, includes: Iterable[str], *, prepend:
     path = Path(path)
     ensure_directory(path.parent)
     lines = _normalize_lines(path)
-    pattern = re.compile(r"^\s*\[include\s+(.+?)\s*\]\s*$")
 
     # Remove any existing references to our includes
     includes_set = {inc.strip() for inc in includes}
-    filtered = [line for line in lines if (match := pattern.match(line)) is None or match.group(1).strip() not in includes_set]
+    filtered = [line for line in lines if (match := _INCLUDE_RE.match(line)) is None or match.group(1).strip() not in includes_set]
 
     # Find SAVE_CONFIG marker if it exists
     save_config_idx = None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import shutil
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -14,8 +15,6 @@ def ensure_directory(path: Path | str) -> None:
 
 def copy_file(src: Path | str, dst: Path | str, *, mode: Optional[int] = None, make_parents: bool = True, verify: bool = True, max_retries: int = 3) -> Path:
     """Copy `src` to `dst` with retry logic, optionally setting permissions and verifying the copy."""
-    import time
-    
     src_path = Path(src)
     dst_path = Path(dst)
     
@@ -100,8 +99,6 @@ def copy_file(src: Path | str, dst: Path | str, *, mode: Optional[int] = None, m
 
 def atomic_copy(src: Path | str, dst: Path | str, *, mode: Optional[int] = None, verify: bool = True, max_retries: int = 3) -> Path:
     """Copy using a temporary file then move into place, with retry logic."""
-    import time
-    
     src_path = Path(src)
     dst_path = Path(dst)
     
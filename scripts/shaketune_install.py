@@ -143,14 +143,15 @@ def deploy_shaketune_repo() -> bool:
 
 def download_get_pip(dest: Path) -> bool:
     logger.info("Downloading get-pip.py from %s", GET_PIP_URL)
+    ensure_directory(dest.parent)
     try:
-        with request.urlopen(GET_PIP_URL, timeout=60) as resp:
-            data = resp.read()
-    except error.URLError as exc:
+        with request.urlopen(GET_PIP_URL, timeout=60) as resp, dest.open("wb") as fh:
+            shutil.copyfileobj(resp, fh, 16 * 1024)
+    except (error.URLError, OSError) as exc:
         logger.error("Unable to download get-pip.py: %s", exc)
+        with suppress(OSError):
+            dest.unlink()
         return False
-    ensure_directory(dest.parent)
-    dest.write_bytes(data)
     return True
 
 
@@ -303,12 +304,15 @@ def create_cpython_symlinks() -> None:
     for root in (SITE_PACKAGES, UDISK_SITE_PACKAGES):
         if not root.exists():
             continue
-        for so_path in root.rglob(f"*{suffix}"):
-            replacement = so_path.with_name(so_path.name.replace(suffix, ".cpython-39.so"))
-            if replacement.exists():
-                continue
-            rel_target = os.path.relpath(so_path, replacement.parent)
-            replacement.symlink_to(rel_target)
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                if not filename.endswith(suffix):
+                    continue
+                replacement = os.path.join(dirpath, filename[: -len(suffix)] + ".cpython-39.so")
+                if os.path.exists(replacement):
+                    continue
+                # Both files share a directory, so the relative target is just the name
+                os.symlink(filename, replacement)
     logger.info("Ensured .cpython-39.so compatibility symlinks exist")
 
 